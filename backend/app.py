@@ -1,7 +1,14 @@
 import datetime
+import hmac
+import operator
 import os
+import shutil
+import tempfile
+import time
 from functools import wraps
-from typing import Callable, Dict, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import click
+import orjson
 import werkzeug.utils
 
 from flask import (
@@ -12,6 +19,8 @@ from flask import (
     request,
     send_from_directory,
 )
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import NotFound, RequestEntityTooLarge
 
 from ntp_client import get_ntp_time
 from storage import (
@@ -20,17 +29,54 @@ from storage import (
     BreakValidationError,
 )
 
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson's native encoder; output is always compact."""
+
+    def _options(self) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=DefaultJSONProvider.default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=DefaultJSONProvider.default, option=self._options()),
+            mimetype=self.mimetype,
+        )
+
+
+def _json_response(payload: Any, status: int = 200) -> Response:
+    return Response(orjson.dumps(payload), status=status, mimetype="application/json")
+
+
 app = Flask(
     __name__,
     static_folder="../frontend",
     static_url_path="/",
     template_folder="templates",
 )
+app.json_provider_class = OrjsonProvider
+app.json = OrjsonProvider(app)
+app.json.sort_keys = False
 
 # Set production configuration
 app.config.update(
     ENV="production" if os.getenv("FLASK_ENV") == "production" else "development",
     DEBUG=os.getenv("FLASK_DEBUG", "false").lower() == "true",
+    # Only enable behind a proxy that handles X-Sendfile (e.g. nginx/Apache)
+    USE_X_SENDFILE=os.getenv("USE_X_SENDFILE", "false").lower() == "true",
+    # Oversized bodies are rejected with 413 before they are read. The limit
+    # covers the whole request, so leave room for multipart headers around a
+    # 10MB sound file.
+    MAX_CONTENT_LENGTH=10 * 1024 * 1024 + 64 * 1024,
+    SEND_FILE_MAX_AGE_DEFAULT=3600,
 )
 
 BASE_DIR = os.path.dirname(__file__)
@@ -45,6 +91,13 @@ ADMIN_USERNAME = os.getenv("ADMIN_USERNAME")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
 AUTH_REALM = os.getenv("ADMIN_REALM", "Break Administration")
 API_VERSION = "1.1"
+PUBLIC_CACHE_CONTROL = "public, max-age=5"
+# The admin UI re-reads /api/breaks right after editing other URLs, so that
+# listing must revalidate on every request instead of serving a stale copy.
+REVALIDATE_CACHE_CONTROL = "no-cache"
+DEFAULT_REVISION_LIMIT = 50
+MAX_PAGE_SIZE = 500
+NTP_CACHE_SECONDS = 1.0
 
 if not ADMIN_USERNAME or not ADMIN_PASSWORD:
     ADMIN_USERNAME = ADMIN_USERNAME or "admin"
@@ -54,40 +107,56 @@ if not ADMIN_USERNAME or not ADMIN_PASSWORD:
     )
 
 store = BreakStore(DB_PATH)
-store.seed_from_json(SEED_PATH)
 
 # Ensure storage directories exist
 os.makedirs(STORAGE_DIR, exist_ok=True)
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(SOUNDS_DIR, exist_ok=True)
 
+_SOUND_ROOTS = (SOUNDS_DIR, app.static_folder)
+
+def _move_file(source: str, target: str) -> None:
+    """Move source to target, copying and deleting it across filesystems."""
+    try:
+        os.replace(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+        os.remove(source)
+
 # Handle migration from old directory structure
 def migrate_storage():
     """Migrate data and sounds from old directory structure to new storage directory"""
     old_data_dir = os.path.join(BASE_DIR, "data")
     old_sounds_dir = os.path.join(BASE_DIR, "sounds")
+    has_old_data = os.path.isdir(old_data_dir)
+    has_old_sounds = os.path.isdir(old_sounds_dir)
+    if not has_old_data and not has_old_sounds:
+        return
 
     # Migrate database if old directory exists and new one doesn't have data
-    if os.path.exists(old_data_dir) and not os.path.exists(os.path.join(DATA_DIR, "breaks.db")):
+    new_db = os.path.join(DATA_DIR, "breaks.db")
+    if has_old_data and not os.path.exists(new_db):
         old_db = os.path.join(old_data_dir, "breaks.db")
         if os.path.exists(old_db):
-            import shutil
-            shutil.copy2(old_db, os.path.join(DATA_DIR, "breaks.db"))
+            # Never hard-link a SQLite file: its WAL/SHM names follow the path
+            # it is opened under, so two names for one inode can corrupt it.
+            # Move any WAL sidecars with it so uncheckpointed pages survive.
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(old_db + suffix):
+                    _move_file(old_db + suffix, new_db + suffix)
+            _move_file(old_db, new_db)
             app.logger.info("Migrated database from old directory structure")
 
     # Migrate sounds if old directory exists and new one is empty
-    if os.path.exists(old_sounds_dir) and (not os.path.exists(SOUNDS_DIR) or not os.listdir(SOUNDS_DIR)):
-        import shutil
+    if has_old_sounds and (not os.path.exists(SOUNDS_DIR) or not os.listdir(SOUNDS_DIR)):
         for filename in os.listdir(old_sounds_dir):
             if filename.lower().endswith(('.mp3', '.wav')):
                 old_file = os.path.join(old_sounds_dir, filename)
                 new_file = os.path.join(SOUNDS_DIR, filename)
-                shutil.copy2(old_file, new_file)
+                # Move, so sounds deleted later are not migrated back on restart
+                _move_file(old_file, new_file)
         app.logger.info("Migrated sound files from old directory structure")
 
-# Perform migration
-migrate_storage()
-
 # Initialize default sound settings if they don't exist
 def initialize_default_sounds():
     default_sounds = [
@@ -109,22 +178,56 @@ def initialize_default_sounds():
             app.logger.error(f"Failed to initialize sound {sound_config['sound_type']}: {e}")
             # Continue with next sound type
 
-initialize_default_sounds()
+
+# Set once initialize_storage has run in this process
+_storage_initialized = False
+
+
+def initialize_storage(force: bool = False) -> None:
+    """Seed breaks, migrate old storage and create default sounds once per start.
+
+    The guard variable is inherited by processes forked or spawned afterwards
+    (gunicorn workers with --preload, the Werkzeug reloader), so they skip it.
+    """
+    global _storage_initialized
+    if not force and os.environ.get("BREAKS_INIT_DONE") == "1":
+        return
+    store.seed_from_json(SEED_PATH)
+    migrate_storage()
+    initialize_default_sounds()
+    os.environ["BREAKS_INIT_DONE"] = "1"
+    _storage_initialized = True
 
 
-def _get_admin_credentials() -> Tuple[str, str]:
-    return ADMIN_USERNAME, ADMIN_PASSWORD
+@app.cli.command("init-db")
+def init_db_command():
+    """Seed the break database and prepare sound storage."""
+    # Importing the app for this command already ran the initialization,
+    # unless BREAKS_INIT_DONE told the import to skip it.
+    if not _storage_initialized:
+        initialize_storage(force=True)
+    click.echo("Storage initialized.")
+
+
+initialize_storage()
+# Release the import-time connection so forked workers each open their own
+store.close()
+
+
+# Encoded once so the per-request check is two constant-time comparisons.
+_EXPECTED_USER = ADMIN_USERNAME.encode()
+_EXPECTED_PASS = ADMIN_PASSWORD.encode()
+_AUTH_CHALLENGE_HEADERS = {"WWW-Authenticate": f'Basic realm="{AUTH_REALM}"'}
 
 
 def requires_auth(func: Callable) -> Callable:
     @wraps(func)
     def wrapper(*args, **kwargs):
         auth = request.authorization
-        expected_user, expected_pass = _get_admin_credentials()
         if (
             not auth
-            or auth.username != expected_user
-            or auth.password != expected_pass
+            or not hmac.compare_digest((auth.username or "").encode(), _EXPECTED_USER)
+            or not hmac.compare_digest((auth.password or "").encode(), _EXPECTED_PASS)
         ):
             return _auth_challenge()
         return func(*args, **kwargs)
@@ -133,10 +236,7 @@ def requires_auth(func: Callable) -> Callable:
 
 
 def _auth_challenge() -> Response:
-    return Response(
-        status=401,
-        headers={"WWW-Authenticate": f'Basic realm="{AUTH_REALM}"'},
-    )
+    return Response(status=401, headers=_AUTH_CHALLENGE_HEADERS)
 
 
 def _get_changed_by() -> str:
@@ -146,36 +246,121 @@ def _get_changed_by() -> str:
     return "unknown"
 
 
+_BREAK_KEYS = ("id", "start", "end", "description")
+_get_break_fields = operator.itemgetter(*_BREAK_KEYS)
+
+
 def _sanitize_break_payload(entry: Dict) -> Dict:
-    return {
-        "id": entry.get("id"),
-        "start": entry.get("start"),
-        "end": entry.get("end"),
-        "description": entry.get("description") or "",
-    }
+    # The store already returns description COALESCEd to ''
+    return dict(zip(_BREAK_KEYS, _get_break_fields(entry)))
+
+
+# Serialized break listings, rebuilt whenever the store's break counter moves.
+# "config_response" is a finished Response shared by all /api/config requests;
+# it must never be mutated after it has been built.
+_breaks_cache: Dict[str, Any] = {"version": None, "config_response": None, "breaks": None}
+
+
+def _get_breaks_cache(version: int) -> Dict[str, Any]:
+    if _breaks_cache["version"] != version:
+        breaks = store.list_breaks_public()
+        _breaks_cache.update(
+            version=version,
+            config_response=_cacheable(
+                Response(
+                    orjson.dumps({"version": API_VERSION, "breaks": breaks}),
+                    mimetype="application/json",
+                ),
+                _version_etag(version),
+            ),
+            breaks=orjson.dumps(
+                {
+                    "breaks": breaks,
+                    "metadata": {"count": len(breaks), "version": API_VERSION},
+                }
+            ),
+        )
+    return _breaks_cache
+
+
+def _get_page_args(default_limit: Optional[int]) -> Tuple[Optional[int], int]:
+    limit = request.args.get("limit", default_limit, type=int)
+    if limit is not None:
+        limit = max(0, min(limit, MAX_PAGE_SIZE))
+    offset = max(0, request.args.get("offset", 0, type=int))
+    return limit, offset
+
+
+def _version_etag(version: int) -> str:
+    return f"{API_VERSION}-{version:x}"
+
+
+def _not_modified(etag: str) -> bool:
+    return request.if_none_match.contains(etag)
+
+
+def _cacheable(
+    response: Response, etag: str, cache_control: str = PUBLIC_CACHE_CONTROL
+) -> Response:
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+# Rendered admin page per API version; the template has no other inputs.
+_admin_page_cache: Dict[str, str] = {}
 
 @app.route('/')
 def serve_frontend():
-    return send_from_directory(app.static_folder, "index.html")
+    return send_from_directory(
+        app.static_folder,
+        "index.html",
+        conditional=True,
+        max_age=app.config["SEND_FILE_MAX_AGE_DEFAULT"],
+    )
 
 @app.route("/admin")
 @requires_auth
 def admin_view():
-    return render_template("admin.html", api_version=API_VERSION)
+    if app.debug:
+        return render_template("admin.html", api_version=API_VERSION)
+    page = _admin_page_cache.get(API_VERSION)
+    if page is None:
+        page = render_template("admin.html", api_version=API_VERSION)
+        _admin_page_cache[API_VERSION] = page
+    return page
 
 @app.route('/api/config')
 def get_config():
-    breaks = [_sanitize_break_payload(item) for item in store.list_breaks()]
-    return jsonify({"version": API_VERSION, "breaks": breaks})
+    version = store.get_change_version("breaks")
+    etag = _version_etag(version)
+    if _not_modified(etag):
+        return _cacheable(Response(status=304), etag)
+    return _get_breaks_cache(version)["config_response"]
 
 @app.route("/api/breaks", methods=["GET"])
 def list_breaks():
-    breaks = [_sanitize_break_payload(item) for item in store.list_breaks()]
-    return jsonify(
-        {
-            "breaks": breaks,
-            "metadata": {"count": len(breaks), "version": API_VERSION},
-        }
+    if "limit" in request.args or "offset" in request.args:
+        limit, offset = _get_page_args(default_limit=None)
+        breaks = store.list_breaks_public(limit=limit, offset=offset)
+        return jsonify(
+            {
+                "breaks": breaks,
+                "metadata": {
+                    "count": len(breaks),
+                    "limit": limit,
+                    "offset": offset,
+                    "version": API_VERSION,
+                },
+            }
+        )
+
+    version = store.get_change_version("breaks")
+    etag = _version_etag(version)
+    if _not_modified(etag):
+        return _cacheable(Response(status=304), etag, REVALIDATE_CACHE_CONTROL)
+    body = _get_breaks_cache(version)["breaks"]
+    return _cacheable(
+        Response(body, mimetype="application/json"), etag, REVALIDATE_CACHE_CONTROL
     )
 
 @app.route("/api/breaks", methods=["POST"])
@@ -241,7 +426,8 @@ def delete_break(break_id: int):
 @app.route("/api/breaks/<int:break_id>/revisions", methods=["GET"])
 @requires_auth
 def list_break_revisions(break_id: int):
-    revisions = store.list_revisions(break_id=break_id)
+    limit, offset = _get_page_args(default_limit=DEFAULT_REVISION_LIMIT)
+    revisions = store.list_revisions(break_id=break_id, limit=limit, offset=offset)
     return jsonify({"revisions": revisions})
 
 @app.route("/api/revisions/<int:revision_id>/restore", methods=["POST"])
@@ -297,6 +483,10 @@ def update_sound_settings():
         app.logger.exception("Failed to update sound setting")
         return jsonify({"error": str(error)}), 500
 
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(error):
+    return jsonify({"error": "Request body must be less than 10MB"}), 413
+
 @app.route("/api/sounds/upload", methods=["POST"])
 @requires_auth
 def upload_sound():
@@ -321,32 +511,30 @@ def upload_sound():
     if file_ext not in allowed_extensions:
         return jsonify({"error": "Only MP3 and WAV files are allowed"}), 400
 
-    # Check file size (10MB limit)
-    file.seek(0, os.SEEK_END)
-    file_size = file.tell()
-    file.seek(0)
-
-    if file_size > 10 * 1024 * 1024:  # 10MB
-        return jsonify({"error": "File size must be less than 10MB"}), 400
-
     try:
         if sound_type == "custom":
             # For library uploads, use the original filename
             safe_filename = werkzeug.utils.secure_filename(file.filename)
 
-            # Handle filename conflicts by appending a number if needed
+            # Claim the name atomically; on conflict let mkstemp pick a unique suffix
             base_name, ext = os.path.splitext(safe_filename)
-            counter = 1
-            final_filename = safe_filename
-
-            while os.path.exists(os.path.join(SOUNDS_DIR, final_filename)):
-                final_filename = f"{base_name}_{counter}{ext}"
-                counter += 1
-
-            file_path = os.path.join(SOUNDS_DIR, final_filename)
+            try:
+                fd = os.open(
+                    os.path.join(SOUNDS_DIR, safe_filename),
+                    os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+                    0o644,
+                )
+                final_filename = safe_filename
+            except FileExistsError:
+                fd, file_path = tempfile.mkstemp(
+                    dir=SOUNDS_DIR, prefix=f"{base_name}_", suffix=ext
+                )
+                os.fchmod(fd, 0o644)
+                final_filename = os.path.basename(file_path)
 
             # Save file
-            file.save(file_path)
+            with os.fdopen(fd, "wb") as target:
+                file.save(target)
 
             # Return library file info
             relative_path = f"sounds/{final_filename}"
@@ -441,49 +629,59 @@ def delete_sound():
 @app.route("/sounds/<filename>")
 def serve_sound(filename):
     """Serve sound files from both backend/sounds/ and frontend/ directories."""
-    # First try to serve from backend/sounds/ (custom uploaded sounds)
-    backend_path = os.path.join(SOUNDS_DIR, filename)
-    if os.path.exists(backend_path):
-        return send_from_directory(SOUNDS_DIR, filename)
-
-    # If not found in backend, try frontend/ (default sounds)
-    frontend_path = os.path.join(BASE_DIR, "frontend", filename)
-    if os.path.exists(frontend_path):
-        return send_from_directory(os.path.join(BASE_DIR, "frontend"), filename)
+    # Custom uploads win over the bundled default sounds
+    for root in _SOUND_ROOTS:
+        try:
+            # Assigned sounds are overwritten in place, so always revalidate
+            return send_from_directory(root, filename, conditional=True, max_age=0)
+        except NotFound:
+            continue
 
     # If not found anywhere, return 404
     return jsonify({"error": "Sound file not found"}), 404
 
 
+# Directory listing of uploaded sounds, reused while the directory mtime is unchanged.
+_sound_dir_cache: Dict[str, Any] = {"mtime": None, "files": []}
+
+
+def _list_sound_files() -> List[str]:
+    try:
+        mtime = os.stat(SOUNDS_DIR).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    if _sound_dir_cache["mtime"] != mtime:
+        files = [
+            filename
+            for filename in os.listdir(SOUNDS_DIR)
+            if filename.lower().endswith(('.mp3', '.wav'))
+        ]
+        _sound_dir_cache.update(mtime=mtime, files=files)
+    return _sound_dir_cache["files"]
+
+
 @app.route("/api/sounds/library", methods=["GET"])
 @requires_auth
 def get_sound_library():
     """Get all available sounds for the library (defaults and uploaded)."""
     try:
-        # Get current sound settings
+        # Get current sound settings and which sound types use each file
         current_settings = {}
         for sound in store.get_sound_settings():
             current_settings[sound["sound_type"]] = sound
+        path_to_types = store.file_path_usage()
 
         # Get uploaded sound files
         uploaded_sounds = []
-        if os.path.exists(SOUNDS_DIR):
-            for filename in os.listdir(SOUNDS_DIR):
-                if filename.lower().endswith(('.mp3', '.wav')):
-                    file_path = f"sounds/{filename}"
-                    # Check if this file is being used by any sound type
-                    used_by = []
-                    for sound_type, settings in current_settings.items():
-                        if settings.get("file_path") == file_path:
-                            used_by.append(sound_type)
-
-                    uploaded_sounds.append({
-                        "id": file_path,
-                        "name": filename,
-                        "type": "custom",
-                        "file_path": file_path,
-                        "used_by": used_by
-                    })
+        for filename in _list_sound_files():
+            file_path = f"sounds/{filename}"
+            uploaded_sounds.append({
+                "id": file_path,
+                "name": filename,
+                "type": "custom",
+                "file_path": file_path,
+                "used_by": path_to_types.get(file_path, [])
+            })
 
         # Default sounds - always include these, they're guaranteed to exist in frontend/
         default_sounds = [
@@ -492,25 +690,18 @@ def get_sound_library():
                 "name": "Pause beginnen (Standard)",
                 "type": "default",
                 "file_path": "break-start.mp3",
-                "used_by": []
+                "used_by": path_to_types.get("break-start.mp3", [])
             },
             {
                 "id": "break-end.mp3",
                 "name": "Pause beenden (Standard)",
                 "type": "default",
                 "file_path": "break-end.mp3",
-                "used_by": []
+                "used_by": path_to_types.get("break-end.mp3", [])
             }
         ]
 
-        # Mark which sounds are currently used
         all_sounds = default_sounds + uploaded_sounds
-        for sound in all_sounds:
-            for sound_type, settings in current_settings.items():
-                if settings.get("file_path") == sound["file_path"]:
-                    if sound_type not in sound["used_by"]:
-                        sound["used_by"].append(sound_type)
-
         return jsonify({
             "sounds": all_sounds,
             "current_settings": current_settings
@@ -523,39 +714,65 @@ def get_sound_library():
 def get_public_sound_settings():
     """Get sound settings for public access (no auth required)."""
     try:
-        sounds = store.get_sound_settings()
-        # Only return enabled sounds with file paths
-        public_sounds = {}
-        for sound in sounds:
-            if sound.get("enabled") and sound.get("file_path"):
-                public_sounds[sound["sound_type"]] = {
-                    "file_path": sound["file_path"],
-                    "volume": sound["volume"]
-                }
-        return jsonify(public_sounds)
+        etag = _version_etag(store.get_change_version("sound_settings"))
+        if _not_modified(etag):
+            return _cacheable(Response(status=304), etag)
+
+        public_sounds = {
+            sound["sound_type"]: {
+                "file_path": sound["file_path"],
+                "volume": sound["volume"]
+            }
+            for sound in store.get_public_sound_settings()
+        }
+        return _cacheable(_json_response(public_sounds), etag)
     except Exception as error:
         app.logger.exception("Failed to get public sound settings")
         return jsonify({}), 500
 
+# Serialized health payload for the current second: [epoch_second, body]
+_health_cache: List[Any] = [None, b""]
+
 @app.route('/api/health')
 def health_check():
-    return jsonify({
-        "status": "ok",
-        "version": "1.0",
-        "timestamp": datetime.datetime.utcnow().isoformat(),
-        "environment": app.config['ENV']
-    })
+    now = int(time.time())
+    if _health_cache[0] != now:
+        _health_cache[:] = [now, orjson.dumps({
+            "status": "ok",
+            "version": "1.0",
+            "timestamp": datetime.datetime.utcfromtimestamp(now).isoformat(),
+            "environment": app.config['ENV']
+        })]
+    return Response(_health_cache[1], mimetype="application/json")
+
+# [time.monotonic() of the last attempt, time.monotonic() of the last success,
+# NTP seconds from that success]. Attempts are throttled whether or not they
+# succeed, so an NTP outage does not queue every request behind the socket
+# timeout; the last good reading is extrapolated in between.
+_ntp_cache: List[Any] = [None, 0.0, None]
 
 @app.route('/api/ntp-time')
 def ntp_time():
-    ntp_time = get_ntp_time()
-    if ntp_time:
-        return jsonify({"ntp_time": ntp_time})
-    return jsonify({"error": "NTP request failed"}), 500
+    now = time.monotonic()
+    attempted_at, fetched_at, value = _ntp_cache
+    if attempted_at is None or now - attempted_at > NTP_CACHE_SECONDS:
+        # Claim the attempt first so concurrent requests serve the cached value
+        _ntp_cache[0] = now
+        ntp_time = get_ntp_time()
+        if ntp_time:
+            fetched_at, value = now, ntp_time
+            _ntp_cache[1:] = [fetched_at, value]
+    if value is None:
+        return jsonify({"error": "NTP request failed"}), 500
+    # Advance the cached reading by the time elapsed since it was fetched
+    return jsonify({"ntp_time": value + int(now - fetched_at)})
 
 # Only run directly in development mode
 if __name__ == '__main__':
     if app.config['ENV'] == 'development':
         app.run(host='0.0.0.0', port=5000, debug=True)
     else:
-        print("This application should be run with a production WSGI server like Gunicorn")
+        print(
+            "This application should be run with a production WSGI server, e.g.: "
+            "gunicorn --worker-class gthread --threads 4 --preload wsgi:app"
+        )
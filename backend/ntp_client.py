@@ -1,19 +1,48 @@
+import os
 import socket
 import struct
+import threading
 
-def get_ntp_time(server="192.168.12.210", port=123):
-    data = b"\x1b" + 47 * b"\0"
-    socket.setdefaulttimeout(5)
+_PACKET = b"\x1b" + 47 * b"\0"
+# Transmit Timestamp seconds live at byte offset 40 of the reply
+_TX_SEC = struct.Struct("!I")
+_TIMEOUT = 5
+
+_lock = threading.Lock()
+_sock = None
+_sock_pid = None
+
+
+def _get_socket():
+    global _sock, _sock_pid
+    # Sockets must not be shared with forked workers, so reopen per process.
+    if _sock is None or _sock_pid != os.getpid():
+        _sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        _sock.settimeout(_TIMEOUT)
+        _sock_pid = os.getpid()
+    return _sock
 
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-            sock.sendto(data, (server, port))
+
+def _reset_socket():
+    global _sock
+    if _sock is not None:
+        _sock.close()
+        _sock = None
+
+
+def get_ntp_time(server="192.168.12.210", port=123):
+    with _lock:
+        try:
+            sock = _get_socket()
+            sock.sendto(_PACKET, (server, port))
             packet, _ = sock.recvfrom(1024)
 
-        if packet and len(packet) >= 48:
-            ntp_time = struct.unpack("!12I", packet[:48])[10]
-            ntp_time -= 2208988800
-            return ntp_time
-    except (OSError, struct.error) as error:
-        print(f"NTP request failed: {error}")
+            if packet and len(packet) >= 48:
+                ntp_time = _TX_SEC.unpack_from(packet, 40)[0]
+                ntp_time -= 2208988800
+                return ntp_time
+        except (OSError, struct.error) as error:
+            # Drop the socket so a late reply cannot answer the next request.
+            _reset_socket()
+            print(f"NTP request failed: {error}")
     return None
@@ -1,9 +1,183 @@
 import json
 import os
+import queue
 import sqlite3
 import threading
 from contextlib import contextmanager
-from typing import Dict, Iterable, List, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+
+# All statements live here so every call passes the same string and hits the
+# connection's prepared statement cache instead of being parsed again.
+_SQL_INSERT_BREAK = """
+    INSERT INTO breaks (start_time, end_time, description)
+    VALUES (?, ?, ?)
+    RETURNING id, start_time AS start, end_time AS end,
+              COALESCE(description, '') AS description
+"""
+
+# Inserts only when no active break overlaps ?1-?2, so the overlap check and
+# the write are one statement. Returns no row when a break is in the way.
+_SQL_INSERT_BREAK_IF_FREE = """
+    INSERT INTO breaks (start_time, end_time, description)
+    SELECT ?1, ?2, ?3
+    WHERE NOT EXISTS (
+        SELECT 1 FROM breaks
+        WHERE is_deleted = 0 AND start_min < t2m(?2) AND end_min > t2m(?1)
+    )
+    RETURNING id, start_time AS start, end_time AS end,
+              COALESCE(description, '') AS description
+"""
+
+_SQL_UPSERT_BREAK = """
+    INSERT INTO breaks (id, start_time, end_time, description)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        start_time = excluded.start_time,
+        end_time = excluded.end_time,
+        description = excluded.description,
+        is_deleted = 0,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+_SQL_INSERT_REVISION = """
+    INSERT INTO break_revisions (
+        break_id, start_time, end_time, description, change_type, changed_by
+    )
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_UPDATE_BREAK = """
+    UPDATE breaks
+    SET start_time = ?, end_time = ?, description = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ? AND is_deleted = 0
+    RETURNING id, start_time AS start, end_time AS end,
+              COALESCE(description, '') AS description
+"""
+
+_SQL_RESTORE_BREAK = """
+    UPDATE breaks
+    SET start_time = ?, end_time = ?, description = ?, is_deleted = 0,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+    RETURNING id, start_time AS start, end_time AS end,
+              COALESCE(description, '') AS description
+"""
+
+_SQL_SOFT_DELETE = """
+    UPDATE breaks
+    SET is_deleted = 1, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ? AND is_deleted = 0
+    RETURNING start_time, end_time, description
+"""
+
+_SQL_COUNT_ACTIVE_BREAKS = "SELECT COUNT(*) FROM breaks WHERE is_deleted = 0"
+
+_SQL_LIST_ACTIVE_BREAKS = """
+    SELECT id, start_time AS start, end_time AS end, description, is_deleted
+    FROM breaks
+    WHERE is_deleted = 0
+    ORDER BY start_min ASC, id ASC
+"""
+
+_SQL_LIST_ALL_BREAKS = """
+    SELECT id, start_time AS start, end_time AS end, description, is_deleted
+    FROM breaks
+    ORDER BY start_min ASC, id ASC
+"""
+
+_SQL_LIST_PUBLIC_BREAKS = """
+    SELECT id, start_time AS start, end_time AS end,
+           COALESCE(description, '') AS description
+    FROM breaks
+    WHERE is_deleted = 0
+    ORDER BY start_min ASC, id ASC
+    LIMIT ? OFFSET ?
+"""
+
+# Parameters are the new break's end and start as HH:MM text. t2m() runs once
+# per statement on those constants; the stored side stays on the indexed
+# integer columns so the probe never calls back into Python per row.
+_SQL_FIND_OVERLAP = """
+    SELECT id, start_time, end_time
+    FROM breaks
+    WHERE is_deleted = 0 AND start_min < t2m(?) AND end_min > t2m(?)
+    LIMIT 1
+"""
+
+_SQL_FIND_OVERLAP_EXCLUDING = """
+    SELECT id, start_time, end_time
+    FROM breaks
+    WHERE is_deleted = 0 AND start_min < t2m(?) AND end_min > t2m(?) AND id != ?
+    LIMIT 1
+"""
+
+_SQL_SELECT_REVISION = """
+    SELECT break_id, start_time, end_time, description
+    FROM break_revisions
+    WHERE id = ?
+"""
+
+_SQL_LIST_REVISIONS = """
+    SELECT id, break_id, start_time AS start, end_time AS end,
+           description, change_type, changed_by, changed_at
+    FROM break_revisions
+    ORDER BY changed_at DESC, id DESC
+    LIMIT ? OFFSET ?
+"""
+
+_SQL_LIST_BREAK_REVISIONS = """
+    SELECT id, break_id, start_time AS start, end_time AS end,
+           description, change_type, changed_by, changed_at
+    FROM break_revisions
+    WHERE break_id = ?
+    ORDER BY changed_at DESC, id DESC
+    LIMIT ? OFFSET ?
+"""
+
+_SQL_SELECT_CHANGE_VERSION = "SELECT version FROM change_counters WHERE name = ?"
+
+_SQL_LIST_SOUND_SETTINGS = """
+    SELECT id, sound_type, file_path, volume, enabled
+    FROM sound_settings ORDER BY sound_type
+"""
+
+_SQL_LIST_PUBLIC_SOUND_SETTINGS = """
+    SELECT sound_type, file_path, volume FROM sound_settings
+    WHERE enabled = 1 AND file_path <> ''
+    ORDER BY sound_type
+"""
+
+_SQL_FILE_PATH_USAGE = """
+    SELECT file_path, GROUP_CONCAT(sound_type) AS sound_types
+    FROM (
+        SELECT file_path, sound_type FROM sound_settings
+        WHERE file_path <> ''
+        ORDER BY sound_type
+    )
+    GROUP BY file_path
+"""
+
+_SQL_SELECT_SOUND_SETTING = """
+    SELECT id, sound_type, file_path, volume, enabled
+    FROM sound_settings WHERE sound_type = ?
+"""
+
+_SQL_SELECT_SOUND_SETTING_BY_ID = """
+    SELECT id, sound_type, file_path, volume, enabled
+    FROM sound_settings WHERE id = ?
+"""
+
+_SQL_SELECT_SOUND_ID = "SELECT id FROM sound_settings WHERE sound_type = ?"
+
+_SQL_INSERT_SOUND_SETTING = """
+    INSERT OR IGNORE INTO sound_settings (sound_type, file_path, volume, enabled)
+    VALUES (?, ?, ?, ?)
+"""
+
+# Covers the schema statements plus every UPDATE shape update_sound_setting builds
+_STATEMENT_CACHE_SIZE = 256
 
 
 class BreakValidationError(Exception):
@@ -14,28 +188,155 @@ class BreakNotFoundError(Exception):
     """Raised when attempting to access a non-existent break."""
 
 
+@dataclass(frozen=True, slots=True)
+class Break:
+    """A break as returned by BreakStore.list_breaks."""
+
+    id: int
+    start: str
+    end: str
+    description: Optional[str]
+    is_deleted: bool
+
+
 class BreakStore:
     """SQLite-backed persistence for break schedules."""
 
-    def __init__(self, db_path: str) -> None:
+    # Directories already created by an earlier instance in this process
+    _dir_cache: Set[str] = set()
+
+    def __init__(self, db_path: str, pool_size: Optional[int] = None) -> None:
         self._db_path = db_path
+        self._uri = db_path.startswith("file:")
+        # Every connection to an in-memory database gets its own empty database,
+        # so those route all reads through the writer connection.
+        self._in_memory = db_path == ":memory:" or (
+            self._uri
+            and (db_path.startswith("file::memory:") or "mode=memory" in db_path)
+        )
         self._lock = threading.RLock()
-        os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        # Bounded pool of read-only connections shared by all threads, so reads
+        # skip the write lock. Each process builds its own, since connections
+        # cannot cross fork(). Slots hold (generation, connection) or None.
+        self._pool_size = pool_size or os.cpu_count() or 1
+        self._read_pool: Optional[queue.Queue] = None
+        self._read_pool_pid: Optional[int] = None
+        self._generation = 0
+        directory = os.path.dirname(db_path)
+        # URIs name their own location, so only plain paths get a directory made
+        if directory and not self._uri and directory not in BreakStore._dir_cache:
+            os.makedirs(directory, exist_ok=True)
+            BreakStore._dir_cache.add(directory)
         self._initialize_schema()
 
-    @contextmanager
-    def _get_conn(self):
-        conn = sqlite3.connect(self._db_path)
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+            uri=self._uri,
+        )
         conn.row_factory = sqlite3.Row
+        conn.create_function("t2m", 1, _sql_time_to_minutes, deterministic=True)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA busy_timeout = 5000")
+        conn.execute("PRAGMA cache_size = -32000")
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection must not be used across fork(), so each process opens its own.
+        if self._conn is None or self._conn_pid != os.getpid():
+            reopened = self._conn_pid is not None
+            self._conn = self._connect()
+            self._conn_pid = os.getpid()
+            if self._in_memory and reopened:
+                # A forked child gets a fresh, empty in-memory database
+                self._initialize_schema()
+        return self._conn
+
+    def _get_read_pool(self) -> queue.Queue:
+        if self._read_pool is None or self._read_pool_pid != os.getpid():
+            with self._lock:
+                if self._read_pool is None or self._read_pool_pid != os.getpid():
+                    pool = queue.Queue(maxsize=self._pool_size)
+                    # Empty slots; connections are opened on first borrow
+                    for _ in range(self._pool_size):
+                        pool.put(None)
+                    self._read_pool = pool
+                    self._read_pool_pid = os.getpid()
+        return self._read_pool
+
+    def close(self) -> None:
+        """Close all connections of this process; the next call reopens them.
+
+        Call this before forking worker processes (e.g. gunicorn --preload).
+        In-memory databases live only as long as their connection, so for
+        those this does nothing.
+        """
+        if self._in_memory:
+            return
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._conn_pid = None
+            # Borrowed readers are replaced on their next borrow, see _read()
+            self._generation += 1
+            pool = self._read_pool
+            if pool is not None and self._read_pool_pid == os.getpid():
+                for _ in range(pool.qsize()):
+                    try:
+                        slot = pool.get_nowait()
+                    except queue.Empty:
+                        break
+                    if slot is not None:
+                        slot[1].close()
+                    pool.put_nowait(None)
+
+    @contextmanager
+    def _write(self):
+        with self._lock:
+            conn = self._connection()
+            # Take the write lock up front: a deferred transaction that reads
+            # first can hit SQLITE_BUSY on upgrade, which busy_timeout won't retry
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    @contextmanager
+    def _read(self):
+        if self._in_memory:
+            with self._lock:
+                yield self._connection()
+            return
+
+        # WAL lets readers run alongside the single writer, so no lock here.
+        # Blocks while every pooled connection is in use.
+        pool = self._get_read_pool()
+        slot = pool.get()
         try:
-            yield conn
-            conn.commit()
+            if slot is None or slot[0] != self._generation:
+                if slot is not None:
+                    slot[1].close()
+                slot = None
+                conn = self._connect()
+                conn.execute("PRAGMA query_only = 1")
+                slot = (self._generation, conn)
+            yield slot[1]
         finally:
-            conn.close()
+            pool.put(slot)
 
     def _initialize_schema(self) -> None:
-        with self._get_conn() as conn:
-            conn.executescript(
+        with self._lock:
+            self._connection().executescript(
                 """
                 PRAGMA foreign_keys = ON;
 
@@ -61,6 +362,12 @@ class BreakStore:
                     FOREIGN KEY (break_id) REFERENCES breaks(id) ON DELETE CASCADE
                 );
 
+                CREATE INDEX IF NOT EXISTS idx_revisions_break_time
+                ON break_revisions (break_id, changed_at DESC, id DESC);
+
+                CREATE INDEX IF NOT EXISTS idx_revisions_time
+                ON break_revisions (changed_at DESC, id DESC);
+
                 CREATE TABLE IF NOT EXISTS sound_settings (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     sound_type TEXT NOT NULL UNIQUE,
@@ -70,18 +377,80 @@ class BreakStore:
                     created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
                     updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
                 );
+
+                CREATE TABLE IF NOT EXISTS change_counters (
+                    name TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 0
+                );
+
+                INSERT OR IGNORE INTO change_counters (name)
+                VALUES ('breaks'), ('sound_settings');
+
+                CREATE TRIGGER IF NOT EXISTS breaks_count_insert AFTER INSERT ON breaks
+                BEGIN
+                    UPDATE change_counters SET version = version + 1 WHERE name = 'breaks';
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS breaks_count_update AFTER UPDATE ON breaks
+                BEGIN
+                    UPDATE change_counters SET version = version + 1 WHERE name = 'breaks';
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS breaks_count_delete AFTER DELETE ON breaks
+                BEGIN
+                    UPDATE change_counters SET version = version + 1 WHERE name = 'breaks';
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS sound_settings_count_insert
+                AFTER INSERT ON sound_settings
+                BEGIN
+                    UPDATE change_counters SET version = version + 1 WHERE name = 'sound_settings';
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS sound_settings_count_update
+                AFTER UPDATE ON sound_settings
+                BEGIN
+                    UPDATE change_counters SET version = version + 1 WHERE name = 'sound_settings';
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS sound_settings_count_delete
+                AFTER DELETE ON sound_settings
+                BEGIN
+                    UPDATE change_counters SET version = version + 1 WHERE name = 'sound_settings';
+                END;
                 """
             )
+            self._ensure_minute_columns(self._connection())
+
+    def _ensure_minute_columns(self, conn: sqlite3.Connection) -> None:
+        """Add indexed integer minute columns derived from the HH:MM text."""
+        columns = {row["name"] for row in conn.execute("PRAGMA table_xinfo(breaks)")}
+        for column, source in (("start_min", "start_time"), ("end_min", "end_time")):
+            if column not in columns:
+                # VIRTUAL so SQLite keeps it in sync on every write, including old rows
+                conn.execute(
+                    f"ALTER TABLE breaks ADD COLUMN {column} INTEGER "
+                    f"GENERATED ALWAYS AS ({_minutes_expr(source)}) VIRTUAL"
+                )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_breaks_active_minutes "
+            "ON breaks (is_deleted, start_min, end_min)"
+        )
+
+    def get_change_version(self, name: str) -> int:
+        """Return the write counter for a table, bumped by triggers on every change."""
+        with self._read() as conn:
+            row = conn.execute(_SQL_SELECT_CHANGE_VERSION, (name,)).fetchone()
+
+        return row["version"] if row else 0
 
     def seed_from_json(self, json_path: str, changed_by: str = "seed") -> None:
         """Populate the database from an existing JSON file if no active entries exist."""
         if not os.path.exists(json_path):
             return
 
-        with self._lock, self._get_conn() as conn:
-            count = conn.execute(
-                "SELECT COUNT(*) FROM breaks WHERE is_deleted = 0"
-            ).fetchone()[0]
+        with self._write() as conn:
+            count = conn.execute(_SQL_COUNT_ACTIVE_BREAKS).fetchone()[0]
             if count > 0:
                 return
 
@@ -89,6 +458,9 @@ class BreakStore:
                 payload = json.load(f)
 
             raw_breaks = payload.get("breaks", [])
+            break_rows = []
+            revision_rows = []
+            unnumbered = []
             for item in raw_breaks:
                 start = item.get("start")
                 end = item.get("end")
@@ -96,95 +468,90 @@ class BreakStore:
                 break_id = item.get("id")
                 if start is None or end is None:
                     continue
-                inserted_id = self._insert_break(
-                    conn,
-                    start_time=start,
-                    end_time=end,
-                    description=description,
-                    break_id=break_id,
+                if break_id is None:
+                    unnumbered.append((start, end, description))
+                    continue
+                break_rows.append((break_id, start, end, description))
+                revision_rows.append(
+                    (break_id, start, end, description, "seed", changed_by)
                 )
-                self._insert_revision(
-                    conn,
-                    break_id=inserted_id,
-                    start_time=start,
-                    end_time=end,
-                    description=description,
-                    change_type="seed",
-                    changed_by=changed_by,
+
+            conn.executemany(_SQL_UPSERT_BREAK, break_rows)
+
+            # Rows without an id need the generated one for their revision. They
+            # go in after the preset ids so they cannot claim one of those.
+            for start, end, description in unnumbered:
+                inserted = self._insert_break(
+                    conn, start_time=start, end_time=end, description=description
+                )
+                revision_rows.append(
+                    (inserted["id"], start, end, description, "seed", changed_by)
                 )
 
-    def list_breaks(self, include_deleted: bool = False) -> List[Dict]:
-        """Return breaks ordered by start time."""
-        query = """
-            SELECT id, start_time AS start, end_time AS end, description, is_deleted
-            FROM breaks
-            {where_clause}
-            ORDER BY start_time ASC, id ASC
-        """.format(
-            where_clause="" if include_deleted else "WHERE is_deleted = 0"
-        )
+            conn.executemany(_SQL_INSERT_REVISION, revision_rows)
+
+    def list_breaks(self, include_deleted: bool = False) -> List[Break]:
+        """Return breaks ordered by start time.
 
-        with self._lock, self._get_conn() as conn:
-            rows = conn.execute(query).fetchall()
+        Items are Break records, read by attribute (``item.id``); they used to
+        be dicts. The HTTP layer uses list_breaks_public, which still returns dicts.
+        """
+        query = _SQL_LIST_ALL_BREAKS if include_deleted else _SQL_LIST_ACTIVE_BREAKS
+        with self._read() as conn:
+            # Plain tuples; no sqlite3.Row needed to fill the dataclass
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            return [Break(*row[:4], bool(row[4])) for row in cursor.execute(query)]
+
+    def list_breaks_public(
+        self, limit: Optional[int] = None, offset: int = 0
+    ) -> List[Dict]:
+        """Return active breaks shaped for the public API, ordered by start time."""
+        with self._read() as conn:
+            rows = conn.execute(
+                _SQL_LIST_PUBLIC_BREAKS, (-1 if limit is None else limit, offset)
+            ).fetchall()
 
-        return [
-            {
-                "id": row["id"],
-                "start": row["start"],
-                "end": row["end"],
-                "description": row["description"],
-                "is_deleted": bool(row["is_deleted"]),
-            }
-            for row in rows
-        ]
+        return [dict(row) for row in rows]
 
     def create_break(
         self, start: str, end: str, description: str, changed_by: str
     ) -> Dict:
-        with self._lock, self._get_conn() as conn:
-            self._validate_time_range(conn, start, end)
-            break_id = self._insert_break(
-                conn, start_time=start, end_time=end, description=description
-            )
+        _check_time_order(start, end)
+        with self._write() as conn:
+            row = conn.execute(
+                _SQL_INSERT_BREAK_IF_FREE, (start, end, description)
+            ).fetchone()
+            if row is None:
+                # Only runs on conflict, to name the break in the way
+                self._check_overlap(conn, start, end)
+                raise BreakValidationError("Break overlaps with an existing break")
+
             self._insert_revision(
                 conn,
-                break_id=break_id,
+                break_id=row["id"],
                 start_time=start,
                 end_time=end,
                 description=description,
                 change_type="create",
                 changed_by=changed_by,
             )
-            row = conn.execute(
-                "SELECT id, start_time AS start, end_time AS end, description "
-                "FROM breaks WHERE id = ?",
-                (break_id,),
-            ).fetchone()
 
         return dict(row)
 
     def update_break(
         self, break_id: int, start: str, end: str, description: str, changed_by: str
     ) -> Dict:
-        with self._lock, self._get_conn() as conn:
-            existing = conn.execute(
-                "SELECT id, start_time, end_time, description, is_deleted "
-                "FROM breaks WHERE id = ?",
-                (break_id,),
+        with self._write() as conn:
+            self._validate_time_range(conn, start, end, exclude_id=break_id)
+
+            # Matches nothing for missing or deleted breaks, so no separate lookup
+            row = conn.execute(
+                _SQL_UPDATE_BREAK, (start, end, description, break_id)
             ).fetchone()
-            if existing is None or existing["is_deleted"]:
+            if row is None:
                 raise BreakNotFoundError(f"Break {break_id} not found")
 
-            self._validate_time_range(conn, start, end, exclude_id=break_id)
-
-            conn.execute(
-                """
-                UPDATE breaks
-                SET start_time = ?, end_time = ?, description = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-                """,
-                (start, end, description, break_id),
-            )
             self._insert_revision(
                 conn,
                 break_id=break_id,
@@ -194,69 +561,45 @@ class BreakStore:
                 change_type="update",
                 changed_by=changed_by,
             )
-            row = conn.execute(
-                "SELECT id, start_time AS start, end_time AS end, description "
-                "FROM breaks WHERE id = ?",
-                (break_id,),
-            ).fetchone()
 
         return dict(row)
 
     def delete_break(self, break_id: int, changed_by: str) -> None:
-        with self._lock, self._get_conn() as conn:
-            existing = conn.execute(
-                "SELECT id, start_time, end_time, description, is_deleted "
-                "FROM breaks WHERE id = ?",
-                (break_id,),
-            ).fetchone()
-            if existing is None or existing["is_deleted"]:
+        with self._write() as conn:
+            deleted = conn.execute(_SQL_SOFT_DELETE, (break_id,)).fetchone()
+            if deleted is None:
                 raise BreakNotFoundError(f"Break {break_id} not found")
 
-            conn.execute(
-                """
-                UPDATE breaks
-                SET is_deleted = 1, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-                """,
-                (break_id,),
-            )
             self._insert_revision(
                 conn,
                 break_id=break_id,
-                start_time=existing["start_time"],
-                end_time=existing["end_time"],
-                description=existing["description"],
+                start_time=deleted["start_time"],
+                end_time=deleted["end_time"],
+                description=deleted["description"],
                 change_type="delete",
                 changed_by=changed_by,
             )
 
-    def list_revisions(self, break_id: Optional[int] = None) -> List[Dict]:
-        query = """
-            SELECT id, break_id, start_time AS start, end_time AS end,
-                   description, change_type, changed_by, changed_at
-            FROM break_revisions
-            {where_clause}
-            ORDER BY changed_at DESC, id DESC
-        """.format(
-            where_clause="WHERE break_id = ?" if break_id else ""
-        )
-
-        params: Iterable = (break_id,) if break_id else ()
-        with self._lock, self._get_conn() as conn:
+    def list_revisions(
+        self,
+        break_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict]:
+        page = (-1 if limit is None else limit, offset)
+        # Compare with None: 0 is a valid id and must still filter
+        if break_id is None:
+            query, params = _SQL_LIST_REVISIONS, page
+        else:
+            query, params = _SQL_LIST_BREAK_REVISIONS, (break_id, *page)
+        with self._read() as conn:
             rows = conn.execute(query, params).fetchall()
 
         return [dict(row) for row in rows]
 
     def restore_revision(self, revision_id: int, changed_by: str) -> Dict:
-        with self._lock, self._get_conn() as conn:
-            revision = conn.execute(
-                """
-                SELECT break_id, start_time, end_time, description
-                FROM break_revisions
-                WHERE id = ?
-                """,
-                (revision_id,),
-            ).fetchone()
+        with self._write() as conn:
+            revision = conn.execute(_SQL_SELECT_REVISION, (revision_id,)).fetchone()
             if revision is None:
                 raise BreakNotFoundError(f"Revision {revision_id} not found")
 
@@ -271,19 +614,15 @@ class BreakStore:
                 exclude_id=break_id,
             )
 
-            conn.execute(
-                """
-                UPDATE breaks
-                SET start_time = ?, end_time = ?, description = ?, is_deleted = 0, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-                """,
+            row = conn.execute(
+                _SQL_RESTORE_BREAK,
                 (
                     revision["start_time"],
                     revision["end_time"],
                     revision["description"],
                     break_id,
                 ),
-            )
+            ).fetchone()
             self._insert_revision(
                 conn,
                 break_id=break_id,
@@ -293,11 +632,6 @@ class BreakStore:
                 change_type="restore",
                 changed_by=changed_by,
             )
-            row = conn.execute(
-                "SELECT id, start_time AS start, end_time AS end, description "
-                "FROM breaks WHERE id = ?",
-                (break_id,),
-            ).fetchone()
 
         return dict(row)
 
@@ -308,32 +642,11 @@ class BreakStore:
         start_time: str,
         end_time: str,
         description: str,
-        break_id: Optional[int] = None,
-    ) -> int:
-        if break_id is None:
-            cursor = conn.execute(
-                """
-                INSERT INTO breaks (start_time, end_time, description)
-                VALUES (?, ?, ?)
-                """,
-                (start_time, end_time, description),
-            )
-            return cursor.lastrowid
-
-        conn.execute(
-            """
-            INSERT INTO breaks (id, start_time, end_time, description)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-                start_time = excluded.start_time,
-                end_time = excluded.end_time,
-                description = excluded.description,
-                is_deleted = 0,
-                updated_at = CURRENT_TIMESTAMP
-            """,
-            (break_id, start_time, end_time, description),
-        )
-        return break_id
+    ) -> sqlite3.Row:
+        """Insert a break and return the stored row in its public shape."""
+        return conn.execute(
+            _SQL_INSERT_BREAK, (start_time, end_time, description)
+        ).fetchone()
 
     def _insert_revision(
         self,
@@ -347,50 +660,48 @@ class BreakStore:
         changed_by: str,
     ) -> None:
         conn.execute(
-            """
-            INSERT INTO break_revisions (
-                break_id, start_time, end_time, description, change_type, changed_by
-            )
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
+            _SQL_INSERT_REVISION,
             (break_id, start_time, end_time, description, change_type, changed_by),
         )
 
     def get_sound_settings(self) -> List[Dict]:
         """Return all sound settings."""
-        with self._lock, self._get_conn() as conn:
-            rows = conn.execute(
-                "SELECT id, sound_type, file_path, volume, enabled FROM sound_settings ORDER BY sound_type"
-            ).fetchall()
+        with self._read() as conn:
+            rows = conn.execute(_SQL_LIST_SOUND_SETTINGS).fetchall()
+
+        return [dict(row) for row in rows]
+
+    def get_public_sound_settings(self) -> List[Dict]:
+        """Return enabled sound settings that have a file configured."""
+        with self._read() as conn:
+            rows = conn.execute(_SQL_LIST_PUBLIC_SOUND_SETTINGS).fetchall()
 
         return [dict(row) for row in rows]
 
+    def file_path_usage(self) -> Dict[str, List[str]]:
+        """Return the sound types assigned to each configured file path."""
+        with self._read() as conn:
+            rows = conn.execute(_SQL_FILE_PATH_USAGE).fetchall()
+
+        return {row["file_path"]: row["sound_types"].split(",") for row in rows}
+
     def get_sound_setting(self, sound_type: str) -> Optional[Dict]:
         """Return a specific sound setting."""
-        with self._lock, self._get_conn() as conn:
-            row = conn.execute(
-                "SELECT id, sound_type, file_path, volume, enabled FROM sound_settings WHERE sound_type = ?",
-                (sound_type,)
-            ).fetchone()
+        with self._read() as conn:
+            row = conn.execute(_SQL_SELECT_SOUND_SETTING, (sound_type,)).fetchone()
 
         return dict(row) if row else None
 
     def update_sound_setting(self, sound_type: str, file_path: str = None, volume: int = None, enabled: bool = None) -> Dict:
         """Update a sound setting."""
-        with self._lock, self._get_conn() as conn:
+        with self._write() as conn:
             # Check if sound type exists
-            existing = conn.execute(
-                "SELECT id FROM sound_settings WHERE sound_type = ?",
-                (sound_type,)
-            ).fetchone()
+            existing = conn.execute(_SQL_SELECT_SOUND_ID, (sound_type,)).fetchone()
 
             if existing is None:
                 # Create new sound setting with INSERT OR IGNORE to avoid race conditions
                 cursor = conn.execute(
-                    """
-                    INSERT OR IGNORE INTO sound_settings (sound_type, file_path, volume, enabled)
-                    VALUES (?, ?, ?, ?)
-                    """,
+                    _SQL_INSERT_SOUND_SETTING,
                     (sound_type, file_path or '', volume if volume is not None else 50, enabled if enabled is not None else True)
                 )
                 sound_id = cursor.lastrowid
@@ -398,8 +709,7 @@ class BreakStore:
                 # If insert was ignored (record already exists), fetch the existing ID
                 if sound_id == 0:
                     existing = conn.execute(
-                        "SELECT id FROM sound_settings WHERE sound_type = ?",
-                        (sound_type,)
+                        _SQL_SELECT_SOUND_ID, (sound_type,)
                     ).fetchone()
                     if existing:
                         sound_id = existing['id']
@@ -430,8 +740,7 @@ class BreakStore:
                 )
 
             row = conn.execute(
-                "SELECT id, sound_type, file_path, volume, enabled FROM sound_settings WHERE id = ?",
-                (sound_id,)
+                _SQL_SELECT_SOUND_SETTING_BY_ID, (sound_id,)
             ).fetchone()
 
         return dict(row)
@@ -448,33 +757,50 @@ class BreakStore:
         *,
         exclude_id: Optional[int] = None,
     ) -> None:
-        start_minutes = _time_to_minutes(start)
-        end_minutes = _time_to_minutes(end)
-        if start_minutes >= end_minutes:
-            raise BreakValidationError("Start time must be earlier than end time")
-
-        query = """
-            SELECT id, start_time, end_time
-            FROM breaks
-            WHERE is_deleted = 0
-        """
-        params: List = []
-        if exclude_id is not None:
-            query += " AND id != ?"
-            params.append(exclude_id)
-
-        rows = conn.execute(query, params).fetchall()
-        for row in rows:
-            existing_start = _time_to_minutes(row["start_time"])
-            existing_end = _time_to_minutes(row["end_time"])
-            if _ranges_overlap(start_minutes, end_minutes, existing_start, existing_end):
-                raise BreakValidationError(
-                    f"Break overlaps with existing break {row['id']} "
-                    f"({row['start_time']} - {row['end_time']})"
-                )
+        _check_time_order(start, end)
+        self._check_overlap(conn, start, end, exclude_id=exclude_id)
+
+    def _check_overlap(
+        self,
+        conn: sqlite3.Connection,
+        start: str,
+        end: str,
+        *,
+        exclude_id: Optional[int] = None,
+    ) -> None:
+        if exclude_id is None:
+            row = conn.execute(_SQL_FIND_OVERLAP, (end, start)).fetchone()
+        else:
+            row = conn.execute(
+                _SQL_FIND_OVERLAP_EXCLUDING, (end, start, exclude_id)
+            ).fetchone()
+        if row is not None:
+            raise BreakValidationError(
+                f"Break overlaps with existing break {row['id']} "
+                f"({row['start_time']} - {row['end_time']})"
+            )
+
+
+# Every valid HH:MM (and unpadded H:MM) string, so the common case is one lookup
+_MINUTES_BY_TIME: Dict[str, int] = {}
+for _h in range(24):
+    for _m in range(60):
+        _MINUTES_BY_TIME[f"{_h:02d}:{_m:02d}"] = _h * 60 + _m
+        _MINUTES_BY_TIME[f"{_h}:{_m:02d}"] = _h * 60 + _m
+del _h, _m
 
 
 def _time_to_minutes(value: str) -> int:
+    if isinstance(value, str):
+        minutes = _MINUTES_BY_TIME.get(value)
+        if minutes is not None:
+            return minutes
+
+    # Unusual spellings and invalid input take the slow path for exact errors
+    return _parse_time(value)
+
+
+def _parse_time(value: str) -> int:
     try:
         hours, minutes = value.split(":")
         h = int(hours)
@@ -488,5 +814,22 @@ def _time_to_minutes(value: str) -> int:
     return h * 60 + m
 
 
-def _ranges_overlap(start_a: int, end_a: int, start_b: int, end_b: int) -> bool:
-    return max(start_a, start_b) < min(end_a, end_b)
+def _check_time_order(start: str, end: str) -> None:
+    if _time_to_minutes(start) >= _time_to_minutes(end):
+        raise BreakValidationError("Start time must be earlier than end time")
+
+
+def _sql_time_to_minutes(value: str) -> Optional[int]:
+    """SQL function t2m(): minutes since midnight, or NULL for invalid times."""
+    try:
+        return _time_to_minutes(value)
+    except BreakValidationError:
+        return None
+
+
+def _minutes_expr(column: str) -> str:
+    """SQL expression turning an H:MM/HH:MM text column into minutes."""
+    return (
+        f"CAST(substr({column}, 1, instr({column}, ':') - 1) AS INTEGER) * 60"
+        f" + CAST(substr({column}, instr({column}, ':') + 1) AS INTEGER)"
+    )
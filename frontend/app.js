@@ -73,7 +73,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
   async function fetchSoundSettings() {
     try {
-      const response = await fetch("/api/public/sounds", { cache: "no-store" });
+      const response = await fetch("/api/public/sounds", { cache: "no-cache" });
       if (!response.ok) {
         throw new Error("Fehler beim Abrufen der Sound-Einstellungen");
       }
@@ -105,7 +105,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
   async function fetchConfig() {
     try {
-      const response = await fetch("/api/config", { cache: "no-store" });
+      const response = await fetch("/api/config", { cache: "no-cache" });
       if (!response.ok) {
         throw new Error("Fehler beim Abrufen der Konfiguration");
       }